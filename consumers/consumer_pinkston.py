@@ -3,6 +3,9 @@ consumer_pinkston.py
 
 Consume json messages from a live data file. 
 Insert the processed messages into a database.
+Each message is written once to streamed_messages_pinkston;
+insights_pinkston is a view over that table.
+timestamp and processed_at are stored as unix epoch microseconds.
 
 Example JSON message
 {
@@ -15,8 +18,10 @@ Example JSON message
     "message_length": 42
 }
 
-Database functions are in consumers/db_sqlite_case.py.
+Database functions for the streamed_messages_pinkston table and insights view are defined below.
 Environment variables are in utils/utils_config module. 
+Per-message and per-batch logging is at DEBUG level with lazy arguments,
+so it costs nothing at the default INFO level.
 
 This file is based on file_consumer_case.py but modified by James Pinkston.
 """
@@ -26,135 +31,635 @@ This file is based on file_consumer_case.py but modified by James Pinkston.
 #####################################
 
 # import from standard library
-import json
+import functools
+import mmap
+import os
 import pathlib
+import queue
 import sys
+import threading
 import time
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Any, Callable, Iterator, List, Tuple
 import sqlite3
 
+# import external packages
+import msgspec
+import numpy as np
+
+# numba is optional; without it the labeling kernel runs as plain numpy
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# inotify_simple is Linux-only; other platforms fall back to time.sleep
+try:
+    from inotify_simple import INotify, flags
+except ImportError:
+    INotify = None
+
 # import from local modules
 import utils.utils_config as config
 from utils.utils_logger import logger
-from .sqlite_consumer_case import init_db, insert_message
 
 #####################################
-# Function to process a single message
+# Constants
+#####################################
+
+# Insight columns, in insert order and as exposed by the insights_pinkston view
+COLS = (
+    "message",
+    "author",
+    "timestamp",
+    "category",
+    "sentiment",
+    "sentiment_label",
+    "keyword_mentioned",
+    "message_length",
+    "word_count",
+    "processed_at",
+)
+
+# Physical table behind the insights_pinkston view. It has its own name so
+# sqlite_consumer_case.init_db(), which recreates streamed_messages with its
+# own columns, cannot replace it on a shared database.
+MESSAGES_TABLE = "streamed_messages_pinkston"
+
+# A processed message as a tuple in COLS order
+InsightRow = Tuple[str, Optional[str], Optional[int], Optional[str], float, str, Optional[str], int, int, int]
+
+# Built once from COLS at import; sqlite3's per-connection statement cache
+# then reuses the compiled statement for every executemany call
+INSERT_SQL = (
+    f"INSERT INTO {MESSAGES_TABLE}(" + ",".join(COLS) + ") VALUES(" + ",".join("?" * len(COLS)) + ")"
+)
+
+# Rows buffered before an executemany flush
+BATCH_SIZE = 1000
+
+# Processed rows the parser may run ahead of the writer thread
+QUEUE_MAXSIZE = 10_000
+
+# Numeric columns of a MessageBatch; string columns are kept in lists.
+# sentiment is float64 so the 0.4 / 0.6 label boundaries compare exactly.
+BATCH_DTYPE = np.dtype(
+    [("sentiment", "f8"), ("message_length", "i4"), ("word_count", "i4"), ("label", "u1")]
+)
+
+# Messages at least this long are word-counted without split()
+LONG_MESSAGE_CHARS = 256
+
+# Bytes treated as whitespace around a live data line
+_WHITESPACE = b" \t\r\n\x0b\x0c"
+
+# Bumped whenever init_insights_db's DDL changes; stored in PRAGMA user_version
+SCHEMA_VERSION = 2
+
+# Page size for newly created databases; larger pages pack more rows each
+PAGE_SIZE = 8192
+
+# Connection settings applied by init_insights_db
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL;",
+    "PRAGMA synchronous=NORMAL;",
+    "PRAGMA temp_store=MEMORY;",
+    "PRAGMA cache_size=-65536;",  # 64 MB page cache
+    "PRAGMA mmap_size=268435456;",  # 256 MB memory map
+)
+
+#####################################
+# Raw message decoding
+#####################################
+
+class RawMessage(msgspec.Struct, frozen=True):
+    """
+    One producer message as decoded from the live data file.
+    Fields not listed here are ignored. Pass-through fields are stored
+    as given, like the dict-based consumer did.
+    """
+    message: Optional[str] = ""
+    author: Any = None
+    timestamp: Optional[str] = None
+    category: Any = None
+    sentiment: float = 0.0
+    keyword_mentioned: Any = None
+    # None means "use len(message)"
+    message_length: Optional[int] = None
+
+# strict=False converts "0.5", 42.0 and "42" the way float()/int() did
+_DECODER = msgspec.json.Decoder(RawMessage, strict=False)
+
+def decode_message(line: Any) -> Optional[RawMessage]:
+    """
+    Decode one JSON line straight into a RawMessage, without an
+    intermediate dict.
+    Lines with mistyped fields are logged and skipped (None);
+    malformed JSON still raises.
+    """
+    try:
+        return _DECODER.decode(line)
+    except msgspec.ValidationError as e:
+        logger.error(f"Error processing message: {e}")
+        return None
+
+#####################################
+# Timestamp helper
+#####################################
+
+@functools.lru_cache(maxsize=1024)
+def parse_timestamp_us(timestamp: Optional[str]) -> Optional[int]:
+    """
+    Convert an ISO 8601 timestamp string to unix epoch microseconds.
+    Naive timestamps are read as local time, matching the producer.
+    Cached because the producer emits many messages per second.
+    """
+    if timestamp is None:
+        return None
+    return round(datetime.fromisoformat(timestamp).timestamp() * 1_000_000)
+
+#####################################
+# Sentiment labeling kernel
+#####################################
+
+# Sentiment label for each kernel code
+LABELS = ("low", "medium", "high")
+_LABELS = np.array(LABELS)
+
+# Upper bin edges for searchsorted(side="right"): codes are 0 below 0.4,
+# 1 from 0.4 through 0.6 inclusive, and 2 above 0.6
+_BINS = np.array([0.4, np.nextafter(0.6, np.inf)], dtype=np.float64)
+
+def _label_codes(sentiments: np.ndarray) -> np.ndarray:
+    """
+    Map sentiments to label codes: 0 = low, 1 = medium, 2 = high.
+    NaN sorts past every bin, so it is reset to low to match the comparisons.
+    """
+    codes = np.searchsorted(_BINS, sentiments, side="right").astype(np.uint8)
+    codes[np.isnan(sentiments)] = 0
+    return codes
+
+if njit is not None:
+
+    # Explicit signatures compile at import (or load from the on-disk cache)
+    # instead of on the first call, and skip the dispatcher's type lookup.
+
+    @njit("uint8(float64)", cache=True)
+    def _score(sentiment):
+        """
+        Label code for one sentiment: 0 = low, 1 = medium, 2 = high.
+        """
+        return np.uint8(sentiment > 0.6) + np.uint8(sentiment >= 0.4)
+
+    @njit("uint8[::1](float64[::1])", cache=True)
+    def label_kernel(sentiments):
+        """
+        Compiled version of _label_codes.
+        _score is inlined into the loop, so the body is a compare-and-add
+        with no branches and LLVM can vectorize it.
+        """
+        out = np.empty(sentiments.shape[0], dtype=np.uint8)
+        for i in range(sentiments.shape[0]):
+            out[i] = _score(sentiments[i])
+        return out
+
+else:
+    label_kernel = _label_codes
+
+#####################################
+# Functions to process messages
 # #####################################
 
-def process_message(raw_message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+def count_words(text: str) -> int:
+    """
+    Count whitespace-separated words, matching len(text.split()).
+    Single-spaced text is counted with str.count in one pass without
+    building a list; anything else falls back to split().
+    """
+    if text and text.isprintable() and "  " not in text and text[0] != " " and text[-1] != " ":
+        return text.count(" ") + 1
+    return len(text.split())
+
+def _normalize_message(raw_message: RawMessage) -> tuple:
+    """
+    Coerce raw message fields into a tuple in COLS order, minus sentiment_label.
+    Raises if a field cannot be converted.
+    """
+    text = raw_message.message or ""
+    length = raw_message.message_length
+    return (
+        text,
+        raw_message.author,
+        parse_timestamp_us(raw_message.timestamp),
+        raw_message.category,
+        float(raw_message.sentiment),
+        raw_message.keyword_mentioned,
+        len(text) if length is None else int(length),
+        # split() is faster for short messages; count_words avoids the list for long ones
+        len(text.split()) if len(text) < LONG_MESSAGE_CHARS else count_words(text),
+        time.time_ns() // 1000,
+    )
+
+def _with_label(fields: tuple, label: str) -> InsightRow:
+    """
+    Insert sentiment_label into a normalized tuple at its COLS position.
+    """
+    message, author, timestamp, category, sentiment, keyword, length, words, processed_at = fields
+    return (message, author, timestamp, category, sentiment, label, keyword, length, words, processed_at)
+
+def process_message(raw_message: RawMessage) -> Optional[InsightRow]:
     """
-    Process and transform a single JSON message into a processed message.
-    Converts message fields to appropriate data types.
+    Process and transform a single JSON message into a processed row.
+    Converts message fields to appropriate data types and
+    returns them as a tuple in COLS order.
 
     """
     try:
-        text = raw_message.get("message", "") or ""
-        sentiment = float(raw_message.get("sentiment", 0.0))
-        word_count = len(text.split())
-
-        # sentiment labeling
-        if sentiment > 0.6:
-            label = "high"
-        elif sentiment >= 0.4:
-            label = "medium"
-        else:
-            label = "low"
-
-        processed = {
-            "message": text,
-            "author": raw_message.get("author"),
-            "timestamp": raw_message.get("timestamp"),
-            "category": raw_message.get("category"),
-            "sentiment": sentiment,
-            "sentiment_label": label,
-            "keyword_mentioned": raw_message.get("keyword_mentioned"),
-            "message_length": int(raw_message.get("message_length", len(text))),
-            "word_count": word_count,
-            "processed_at": datetime.utcnow().isoformat(),
-        }
-        logger.info(f"Processed message: {processed}")
+        fields = _normalize_message(raw_message)
+        sentiment = fields[4]
+
+        # sentiment labeling: the two comparisons sum to a LABELS index
+        processed = _with_label(fields, LABELS[(sentiment > 0.6) + (sentiment >= 0.4)])
+
+        logger.debug("Processed message: {}", processed)
         return processed
     except Exception as e:
         logger.error(f"Error processing message: {e}")
         return None
 
+class MessageBatch:
+    """
+    Columnar buffer for in-flight messages.
+    Numeric fields live in one BATCH_DTYPE structured array and each
+    string field in its own list, filled as lines are parsed.
+    Rows are only assembled into tuples when the batch is written.
+    """
+
+    def __init__(self, capacity: int = BATCH_SIZE):
+        self.numeric = np.empty(max(capacity, 1), dtype=BATCH_DTYPE)
+        self.size = 0
+        self.messages: List[str] = []
+        self.authors: List[Any] = []
+        self.timestamps: List[Optional[int]] = []
+        self.categories: List[Any] = []
+        self.keywords: List[Any] = []
+        self.processed_at: List[int] = []
+
+    def __len__(self) -> int:
+        return self.size
+
+    def append(self, raw_message: RawMessage) -> None:
+        """
+        Add one raw message to the batch.
+        Messages that fail to convert are logged and skipped.
+        """
+        try:
+            text, author, timestamp, category, sentiment, keyword, length, words, processed_at = (
+                _normalize_message(raw_message)
+            )
+            if self.size == len(self.numeric):
+                self.numeric = np.concatenate([self.numeric, np.empty_like(self.numeric)])
+            # Numeric write first: it is the only step that can still raise
+            self.numeric[self.size] = (sentiment, length, words, 0)
+        except Exception as e:
+            logger.error(f"Error processing message: {e}")
+            return
+        self.messages.append(text)
+        self.authors.append(author)
+        self.timestamps.append(timestamp)
+        self.categories.append(category)
+        self.keywords.append(keyword)
+        self.processed_at.append(processed_at)
+        self.size += 1
+
+    def rows(self) -> List[InsightRow]:
+        """
+        Label every sentiment in one label_kernel call and
+        return the batch as tuples in COLS order.
+        """
+        numeric = self.numeric[: self.size]
+        numeric["label"] = label_kernel(np.ascontiguousarray(numeric["sentiment"]))
+        return list(
+            zip(
+                self.messages,
+                self.authors,
+                self.timestamps,
+                self.categories,
+                numeric["sentiment"].tolist(),
+                _LABELS[numeric["label"]].tolist(),
+                self.keywords,
+                numeric["message_length"].tolist(),
+                numeric["word_count"].tolist(),
+                self.processed_at,
+            )
+        )
+
+    def clear(self) -> None:
+        """Empty the batch, keeping the allocated numeric array."""
+        self.size = 0
+        for column in (
+            self.messages,
+            self.authors,
+            self.timestamps,
+            self.categories,
+            self.keywords,
+            self.processed_at,
+        ):
+            column.clear()
+
 #####################################
 # Insights DB helpers
 #####################################
 
-def init_insights_db(db_path: pathlib.Path) -> None:
+def _insights_schema_current(conn: sqlite3.Connection) -> bool:
+    """
+    Return True if user_version is current, the messages table has every
+    column in COLS, and the insights_pinkston view exists.
+    Another process can drop or replace objects without touching user_version,
+    so the version alone is not trusted.
+    """
+    (version,) = conn.execute("PRAGMA user_version;").fetchone()
+    if version < SCHEMA_VERSION:
+        return False
+    columns = {row[1] for row in conn.execute(f"PRAGMA table_info({MESSAGES_TABLE});")}
+    if not columns.issuperset(COLS):
+        return False
+    view = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'view' AND name = 'insights_pinkston';"
+    ).fetchone()
+    return view is not None
+
+def init_insights_db(conn: sqlite3.Connection) -> None:
     """
-    Initialize the insights_pinkston table if it doesn't exist.
+    Create the streamed_messages_pinkston table with the insight columns and
+    expose it as the insights_pinkston view, so each message is written once,
+    then tune the connection for streaming ingest.
+    The DDL only runs when the schema is missing, incomplete, or older than
+    SCHEMA_VERSION, so reconnecting to an up-to-date database costs a few
+    catalog reads.
     """
-    str_path = str(db_path)
     try:
-        db_path.parent.mkdir(parents=True, exist_ok=True)
-        with sqlite3.connect(str_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                CREATE TABLE IF NOT EXISTS insights_pinkston (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    message TEXT,
-                    author TEXT,
-                    timestamp TEXT,
-                    category TEXT,
-                    sentiment REAL,
-                    sentiment_label TEXT,
-                    keyword_mentioned TEXT,
-                    message_length INTEGER,
-                    word_count INTEGER,
-                    processed_at TEXT
-                );
+        if not _insights_schema_current(conn):
+            # Only takes effect on a new, empty database
+            conn.execute(f"PRAGMA page_size={PAGE_SIZE};")
+            conn.execute("BEGIN")
+            # Earlier versions kept insights_pinkston as a physical table,
+            # or as a view over the shared streamed_messages table
+            existing = conn.execute(
+                "SELECT type FROM sqlite_master WHERE name = 'insights_pinkston';"
+            ).fetchone()
+            if existing:
+                conn.execute(f"DROP {existing[0].upper()} insights_pinkston;")
+
+            columns = {row[1] for row in conn.execute(f"PRAGMA table_info({MESSAGES_TABLE});")}
+            if not columns.issuperset(COLS):
+                conn.execute(f"DROP TABLE IF EXISTS {MESSAGES_TABLE};")
+                conn.execute(
+                    f"""
+                    CREATE TABLE {MESSAGES_TABLE} (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        message TEXT,
+                        author TEXT,
+                        timestamp INTEGER,
+                        category TEXT,
+                        sentiment REAL,
+                        sentiment_label TEXT,
+                        keyword_mentioned TEXT,
+                        message_length INTEGER,
+                        word_count INTEGER,
+                        processed_at INTEGER
+                    );
+                    """
+                )
+            conn.execute(
+                f"""
+                CREATE VIEW insights_pinkston AS
+                SELECT {", ".join(COLS)} FROM {MESSAGES_TABLE};
                 """
             )
+            conn.execute(f"PRAGMA user_version={SCHEMA_VERSION};")
             conn.commit()
-        logger.info(f"Initialized insights DB/table at {str_path}.")
+            logger.info(f"Created {MESSAGES_TABLE} table and insights view (schema v{SCHEMA_VERSION}).")
+        # WAL appends instead of rewriting a rollback journal; NORMAL syncs
+        # only at checkpoints, which is safe in WAL mode.
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        logger.info("Initialized insights DB connection PRAGMAs.")
     except Exception as e:
+        if conn.in_transaction:
+            conn.rollback()
         logger.error(f"ERROR: Failed to initialize insights DB: {e}")
         raise
 
-def insert_insight(insight: Dict[str, Any], db_path: pathlib.Path) -> None:
+def connect_insights_db(db_path: pathlib.Path) -> sqlite3.Connection:
+    """
+    Open the persistent connection used by the consumer loop and
+    initialize the schema on it.
+    Autocommit mode (isolation_level=None) lets the loop decide
+    when a transaction begins and ends.
     """
-    Insert a single processed insight row into the insights_pinkston table.
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(db_path), isolation_level=None, check_same_thread=False)
+    init_insights_db(conn)
+    logger.info(f"Opened insights DB connection at {db_path}.")
+    return conn
+
+def insert_insights(insights: List[InsightRow], cursor: sqlite3.Cursor) -> None:
+    """
+    Insert a batch of processed insight rows into streamed_messages_pinkston,
+    where they are read back through the insights_pinkston view.
+    Uses the caller's cursor; the caller is responsible for committing,
+    and for rolling back if this raises.
+    """
+    cursor.executemany(INSERT_SQL, insights)
+    logger.debug("Inserted {} insight rows into {}.", len(insights), MESSAGES_TABLE)
+
+def write_rows(rows: List[InsightRow], conn: sqlite3.Connection, cursor: sqlite3.Cursor) -> None:
+    """
+    Write processed rows in a single transaction.
+    If any row fails, the whole batch is rolled back and the failure logged.
     """
-    str_path = str(db_path)
     try:
-        with sqlite3.connect(str_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT INTO insights_pinkston (
-                    message, author, timestamp, category, sentiment, sentiment_label,
-                    keyword_mentioned, message_length, word_count, processed_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    insight.get("message"),
-                    insight.get("author"),
-                    insight.get("timestamp"),
-                    insight.get("category"),
-                    insight.get("sentiment"),
-                    insight.get("sentiment_label"),
-                    insight.get("keyword_mentioned"),
-                    insight.get("message_length"),
-                    insight.get("word_count"),
-                    insight.get("processed_at"),
-                ),
-            )
-            conn.commit()
-        logger.info("Inserted one insight row into insights_pinkston.")
+        conn.execute("BEGIN")
+        insert_insights(rows, cursor)
+        conn.commit()
     except Exception as e:
-        logger.error(f"ERROR: Failed to insert insight into DB: {e}")
+        if conn.in_transaction:
+            conn.rollback()
+        logger.error(f"ERROR: Failed to write {len(rows)} insight rows; batch rolled back: {e}")
+
+def run_writer(conn: sqlite3.Connection, rows: "queue.Queue[Optional[InsightRow]]") -> None:
+    """
+    Writer thread: wait for processed rows, drain up to BATCH_SIZE of them
+    from the queue and write them together, so the next batch is parsed
+    while this one is committed.
+    A None row tells the writer to flush what it has and stop.
+    Only this thread uses conn once it has started.
+    """
+    cursor = conn.cursor()
+    stop = False
+    while not stop:
+        row = rows.get()
+        pending: List[InsightRow] = []
+        while True:
+            if row is None:
+                stop = True
+                break
+            pending.append(row)
+            if len(pending) >= BATCH_SIZE:
+                break
+            try:
+                row = rows.get_nowait()
+            except queue.Empty:
+                break
+        if pending:
+            write_rows(pending, conn, cursor)
+
+def enqueue_batch(batch: MessageBatch, rows: "queue.Queue[Optional[InsightRow]]") -> None:
+    """
+    Clear a processed batch and hand its rows to the writer thread.
+    Blocks while the queue is full. The batch is cleared first, so an
+    interrupt while blocked cannot re-queue rows that were already put.
+    """
+    if not batch:
+        return
+    pending = batch.rows()
+    batch.clear()
+    for row in pending:
+        rows.put(row)
+
+#####################################
+# Live data file change notifications
+#####################################
+
+def open_file_watcher(live_data_path: pathlib.Path) -> Optional["INotify"]:
+    """
+    Watch the live data file's directory for writes.
+    The directory is watched rather than the file because the producer
+    deletes and recreates the file on startup.
+    Returns None when inotify is unavailable.
+    """
+    if INotify is None:
+        return None
+    try:
+        live_data_path.parent.mkdir(parents=True, exist_ok=True)
+        watcher = INotify()
+        watcher.add_watch(str(live_data_path.parent), flags.MODIFY | flags.CREATE | flags.MOVED_TO)
+        return watcher
+    except OSError as e:
+        logger.warning(f"WARNING: inotify unavailable, polling instead: {e}")
+        return None
+
+def wait_for_changes(watcher: Optional["INotify"], live_data_path: pathlib.Path, interval_secs: float) -> None:
+    """
+    Block until the live data file changes or interval_secs elapses.
+    Without a watcher this is a plain sleep.
+    """
+    if watcher is None:
+        time.sleep(interval_secs)
+        return
+    deadline = time.monotonic() + interval_secs
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        # Ignore events for other files in the directory (e.g. the database)
+        for event in watcher.read(timeout=int(remaining * 1000)):
+            if event.name == live_data_path.name:
+                return
+
+#####################################
+# Live data file reader
+#####################################
+
+class LiveFileReader:
+    """
+    Read and decode complete lines from the live data file as it grows.
+    The file descriptor stays open between polls and is only reopened
+    when the producer replaces or truncates the file.
+    New bytes are memory-mapped and each line is handed to the decoder
+    as a memoryview slice of the map, without copying it first.
+    Lines the decoder returns None for are skipped.
+    A trailing partial line is left in the file until its newline arrives.
+    """
+
+    def __init__(
+        self,
+        live_data_path: pathlib.Path,
+        position: int = 0,
+        decode: Optional[Callable[[Any], Any]] = None,
+    ):
+        self.live_data_path = live_data_path
+        # Offset just past the last complete line decoded
+        self.position = position
+        self.decode = decode or decode_message
+        self._fd: Optional[int] = None
+
+    def _replaced(self) -> bool:
+        """Return True if the path no longer refers to the open file."""
+        try:
+            on_disk = os.stat(self.live_data_path)
+        except FileNotFoundError:
+            return True
+        opened = os.fstat(self._fd)
+        return (
+            on_disk.st_ino != opened.st_ino
+            or on_disk.st_dev != opened.st_dev
+            or opened.st_size < self.position
+        )
+
+    def _open(self) -> None:
+        """Open the file (raises FileNotFoundError)."""
+        if self._fd is not None and self._replaced():
+            logger.info("Live data file was replaced; reading from the start.")
+            self.close()
+            self.position = 0
+        if self._fd is None:
+            self._fd = os.open(self.live_data_path, os.O_RDONLY)
+
+    def read_messages(self) -> Iterator[Any]:
+        """Yield each new complete, non-blank line, decoded."""
+        self._open()
+        size = os.fstat(self._fd).st_size
+        if size <= self.position:
+            return
+        # Map only from the allocation boundary at or before position
+        base = self.position - self.position % mmap.ALLOCATIONGRANULARITY
+        mm = mmap.mmap(self._fd, size - base, access=mmap.ACCESS_READ, offset=base)
+        view = memoryview(mm)
+        try:
+            start = self.position - base
+            while True:
+                end = mm.find(b"\n", start)
+                if end < 0:
+                    return
+                line_start, start = start, end + 1
+                self.position = base + start
+                if end == line_start:
+                    continue
+                # Leading whitespace is rare; only then pay for a copy to check for a blank line
+                if mm[line_start] in _WHITESPACE and not mm[line_start:end].strip():
+                    continue
+                # Release the slice even if decoding raises, so the map can close
+                with view[line_start:end] as line:
+                    raw_message = self.decode(line)
+                if raw_message is not None:
+                    yield raw_message
+        finally:
+            view.release()
+            mm.close()
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
 
 #####################################
 # Consume Messages from Live Data File
 #####################################
 
 
-def consume_messages_from_file(live_data_path, sql_path, interval_secs, last_position):
+def consume_messages_from_file(live_data_path, sql_path, interval_secs, last_position, conn=None):
     """
     Consume new messages from a file and process them.
     Each message is expected to be JSON-formatted.
@@ -164,6 +669,8 @@ def consume_messages_from_file(live_data_path, sql_path, interval_secs, last_pos
     - sql_path (pathlib.Path): Path to the SQLite database file.
     - interval_secs (int): Interval in seconds to check for new messages.
     - last_position (int): Last read position in the file.
+    - conn (sqlite3.Connection, optional): Connection from connect_insights_db;
+      opened from sql_path if not given. Closed when consumption stops.
     """
     logger.info("Called consume_messages_from_file() with:")
     logger.info(f"   {live_data_path=}")
@@ -171,49 +678,53 @@ def consume_messages_from_file(live_data_path, sql_path, interval_secs, last_pos
     logger.info(f"   {interval_secs=}")
     logger.info(f"   {last_position=}")
     
-    logger.info("1. Initialize the database.")
-    init_db(sql_path)
-    init_insights_db(sql_path)
+    if conn is None:
+        logger.info("1. Open a persistent database connection and initialize the schema.")
+        conn = connect_insights_db(sql_path)
+    # The table outlives a run and the file is replayed from the start,
+    # so clear rows a previous run already stored
+    conn.execute(f"DELETE FROM {MESSAGES_TABLE};")
+    rows: "queue.Queue[Optional[InsightRow]]" = queue.Queue(maxsize=QUEUE_MAXSIZE)
+    writer = threading.Thread(target=run_writer, args=(conn, rows), name="insights-writer", daemon=True)
+    writer.start()
+    watcher = open_file_watcher(live_data_path)
 
     logger.info("2. Set the last position to 0 to start at the beginning of the file.")
     last_position = 0
+    reader = LiveFileReader(live_data_path, last_position)
+    batch = MessageBatch()
 
-    while True:
-        try:
-            logger.info(f"3. Read from live data file at position {last_position}.")
-            with open(live_data_path, "r") as file:
-                # Move to the last read position
-                file.seek(last_position)
-                
-                while True:
-                    line = file.readline()
-                    if not line:
-                        break
-                    line = line.strip()
-                    if not line:
-                        continue
-
-                
-                    raw = json.loads(line)
-
-                    # Call our process_message function
-                    processed = process_message(raw)
-                    if processed:
-                        insert_message(processed, sql_path)
-                        insert_insight(processed, sql_path)
-
-                    # Update the last position that's been read to the current file position
-                    last_position = file.tell()
-
-            # sleep before checking for more linesS
-            time.sleep(interval_secs) 
-
-        except FileNotFoundError:
-            logger.error(f"ERROR: Live data file not found at {live_data_path}. Make sure the producer is running.")
-            time.sleep(interval_secs)
-        except Exception as e:
-            logger.error(f"ERROR: Error reading from live data file: {e}")
-            sys.exit(11)
+    try:
+        while True:
+            try:
+                logger.debug("3. Read from live data file at position {}.", reader.position)
+                for raw_message in reader.read_messages():
+                    batch.append(raw_message)
+                    if len(batch) >= BATCH_SIZE:
+                        enqueue_batch(batch, rows)
+
+                # Hand off whatever is left from this polling pass
+                enqueue_batch(batch, rows)
+
+                # wait for the file to change before checking for more lines
+                wait_for_changes(watcher, live_data_path, interval_secs)
+
+            except FileNotFoundError:
+                logger.error(f"ERROR: Live data file not found at {live_data_path}. Make sure the producer is running.")
+                wait_for_changes(watcher, live_data_path, interval_secs)
+            except Exception as e:
+                logger.error(f"ERROR: Error reading from live data file: {e}")
+                sys.exit(11)
+    finally:
+        reader.close()
+        if watcher is not None:
+            watcher.close()
+        # Keep rows parsed before the failure, then let the writer
+        # drain the queue before closing its connection
+        enqueue_batch(batch, rows)
+        rows.put(None)
+        writer.join()
+        conn.close()
 
 #####################################
 # Define Main Function
@@ -241,17 +752,16 @@ def main():
         logger.error(f"ERROR: Failed to read environment variables: {e}")
         sys.exit(1)
 
-    logger.info("STEP 2. Initialize a database and create new insights table.")
+    logger.info("STEP 2. Open the database connection and create the insights schema.")
     try:
-        init_db(sqlite_path)
-        init_insights_db(sqlite_path)
+        conn = connect_insights_db(sqlite_path)
     except Exception as e:
         logger.error(f"ERROR: Failed to create db table: {e}")
         sys.exit(3)
 
     logger.info("STEP 3. Begin consuming and storing messages.")
     try:
-        consume_messages_from_file(live_data_path, sqlite_path, interval_secs, 0)
+        consume_messages_from_file(live_data_path, sqlite_path, interval_secs, 0, conn=conn)
     except KeyboardInterrupt:
         logger.warning("Consumer interrupted by user.")
     except Exception as e:
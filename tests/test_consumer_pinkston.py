@@ -0,0 +1,390 @@
+"""
+tests/test_consumer_pinkston.py
+
+Lightweight tests for the custom consumer's processing and insert helpers.
+Uses temp paths so the project database is never touched.
+
+Usage:
+  pytest -q
+"""
+
+#####################################
+# Imports
+#####################################
+
+import pathlib
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+import msgspec
+import numpy as np
+import pytest
+
+from consumers import consumer_pinkston, sqlite_consumer_case
+
+#####################################
+# Helper Functions
+#####################################
+
+
+def _raw(sentiment: float = 0.87) -> consumer_pinkston.RawMessage:
+    """Return a raw message shaped like the producer output."""
+    return consumer_pinkston.RawMessage(
+        message="I just shared a meme! It was amazing.",
+        author="Charlie",
+        timestamp="2025-01-29 14:35:20",
+        category="humor",
+        sentiment=sentiment,
+        keyword_mentioned="meme",
+        message_length=42,
+    )
+
+
+def _field(row: tuple, name: str):
+    """Return a named field from a processed row."""
+    return row[consumer_pinkston.COLS.index(name)]
+
+
+#####################################
+# Processing
+#####################################
+
+
+def test_process_message_labels_sentiment():
+    assert _field(consumer_pinkston.process_message(_raw(0.87)), "sentiment_label") == "high"
+    assert _field(consumer_pinkston.process_message(_raw(0.6)), "sentiment_label") == "medium"
+    assert _field(consumer_pinkston.process_message(_raw(0.4)), "sentiment_label") == "medium"
+    assert _field(consumer_pinkston.process_message(_raw(0.1)), "sentiment_label") == "low"
+
+
+def test_process_message_counts_words():
+    processed = consumer_pinkston.process_message(_raw())
+    assert _field(processed, "word_count") == 8
+    assert _field(processed, "message_length") == 42
+
+
+def test_timestamps_are_epoch_microseconds():
+    row = consumer_pinkston.process_message(_raw())
+    expected = datetime.fromisoformat("2025-01-29 14:35:20").timestamp() * 1_000_000
+    assert _field(row, "timestamp") == round(expected)
+    assert abs(_field(row, "processed_at") - time.time_ns() // 1000) < 2_000_000
+    assert consumer_pinkston.parse_timestamp_us(None) is None
+
+
+def test_count_words_matches_split():
+    for text in ["", "x", "a b c", " a  b ", "a\tb\nc", "a\u3000b", "word " * 100 + "end"]:
+        assert consumer_pinkston.count_words(text) == len(text.split())
+
+
+def test_message_batch_matches_process_message():
+    raws = [_raw(s) for s in (0.0, 0.39, 0.4, 0.6, 0.61, 1.0)]
+    raws.append(consumer_pinkston.RawMessage(message="bad", timestamp="not a time"))
+
+    batch = consumer_pinkston.MessageBatch()
+    for raw in raws:
+        batch.append(raw)
+    rows = batch.rows()
+    assert len(rows) == 6
+    assert [_field(row, "sentiment_label") for row in rows] == [
+        _field(consumer_pinkston.process_message(raw), "sentiment_label") for raw in raws[:6]
+    ]
+
+
+def test_message_batch_grows_and_reuses_storage():
+    batch = consumer_pinkston.MessageBatch(capacity=2)
+    for s in (0.1, 0.5, 0.9):
+        batch.append(_raw(s))
+    batch.append(consumer_pinkston.RawMessage(message_length=2**40))
+    assert len(batch) == 3
+    assert [_field(row, "sentiment_label") for row in batch.rows()] == ["low", "medium", "high"]
+
+    batch.clear()
+    assert len(batch) == 0
+    assert batch.rows() == []
+
+
+def test_label_kernel_matches_numpy_codes():
+    sentiments = np.append(np.linspace(0.0, 1.0, 101), [0.4, 0.6, np.nextafter(0.6, 1.0), np.nan])
+    expected = [
+        consumer_pinkston.LABELS[(s > 0.6) + (s >= 0.4)] for s in sentiments.tolist()
+    ]
+    assert consumer_pinkston._LABELS[consumer_pinkston._label_codes(sentiments)].tolist() == expected
+    assert (
+        consumer_pinkston.label_kernel(sentiments) == consumer_pinkston._label_codes(sentiments)
+    ).all()
+
+
+def test_decode_message_builds_struct():
+    raw = consumer_pinkston.decode_message(
+        b'{"message": "hi there", "sentiment": 0.5, "extra": 1, "message_length": 8}'
+    )
+    assert raw.message == "hi there"
+    assert raw.author is None
+    assert _field(consumer_pinkston.process_message(raw), "word_count") == 2
+
+    # Numeric strings and whole floats convert like float()/int() did
+    assert consumer_pinkston.decode_message(b'{"sentiment": "0.5"}').sentiment == 0.5
+    assert consumer_pinkston.decode_message(b'{"message_length": 42.0}').message_length == 42
+    assert consumer_pinkston.decode_message(b'{"message_length": "42"}').message_length == 42
+    assert consumer_pinkston.decode_message(b'{"author": 5}').author == 5
+
+    assert consumer_pinkston.decode_message(b'{"sentiment": "high"}') is None
+    with pytest.raises(Exception):
+        consumer_pinkston.decode_message(b"not json")
+
+
+#####################################
+# Connection Setup
+#####################################
+
+
+def test_connect_insights_db_enables_wal(tmp_path: pathlib.Path):
+    conn = consumer_pinkston.connect_insights_db(tmp_path / "nested" / "test.sqlite")
+    try:
+        (mode,) = conn.execute("PRAGMA journal_mode;").fetchone()
+        (sync,) = conn.execute("PRAGMA synchronous;").fetchone()
+        assert mode == "wal"
+        assert sync == 1  # NORMAL
+    finally:
+        conn.close()
+
+
+def test_init_insights_db_runs_ddl_once(tmp_path: pathlib.Path):
+    db_path = tmp_path / "test.sqlite"
+    conn = consumer_pinkston.connect_insights_db(db_path)
+    try:
+        (version,) = conn.execute("PRAGMA user_version;").fetchone()
+        (page_size,) = conn.execute("PRAGMA page_size;").fetchone()
+        assert version == consumer_pinkston.SCHEMA_VERSION
+        assert page_size == consumer_pinkston.PAGE_SIZE
+        conn.execute(f"INSERT INTO {consumer_pinkston.MESSAGES_TABLE} (message) VALUES ('kept');")
+    finally:
+        conn.close()
+
+    # Reconnecting to an up-to-date schema must not recreate the table
+    conn = consumer_pinkston.connect_insights_db(db_path)
+    try:
+        (count,) = conn.execute("SELECT COUNT(*) FROM insights_pinkston;").fetchone()
+        assert count == 1
+    finally:
+        conn.close()
+
+
+def test_init_insights_db_migrates_legacy_tables(tmp_path: pathlib.Path):
+    db_path = tmp_path / "test.sqlite"
+    with sqlite3.connect(db_path) as legacy:
+        legacy.execute("CREATE TABLE streamed_messages (id INTEGER PRIMARY KEY, timestamp TEXT);")
+        legacy.execute("CREATE TABLE insights_pinkston (id INTEGER PRIMARY KEY);")
+    legacy.close()
+
+    conn = consumer_pinkston.connect_insights_db(db_path)
+    try:
+        (kind,) = conn.execute(
+            "SELECT type FROM sqlite_master WHERE name = 'insights_pinkston';"
+        ).fetchone()
+        assert kind == "view"
+        columns = [
+            row[1]
+            for row in conn.execute(f"PRAGMA table_info({consumer_pinkston.MESSAGES_TABLE});")
+        ]
+        assert "processed_at" in columns
+    finally:
+        conn.close()
+
+
+def test_init_insights_db_survives_shared_init_db(tmp_path: pathlib.Path):
+    db_path = tmp_path / "test.sqlite"
+    consumer_pinkston.connect_insights_db(db_path).close()
+    # The case consumer recreates streamed_messages without touching user_version
+    sqlite_consumer_case.init_db(db_path)
+
+    conn = consumer_pinkston.connect_insights_db(db_path)
+    try:
+        row = consumer_pinkston.process_message(_raw())
+        consumer_pinkston.write_rows([row], conn, conn.cursor())
+        (count,) = conn.execute("SELECT COUNT(*) FROM insights_pinkston;").fetchone()
+        assert count == 1
+    finally:
+        conn.close()
+
+
+def test_init_insights_db_recreates_dropped_schema(tmp_path: pathlib.Path):
+    db_path = tmp_path / "test.sqlite"
+    with consumer_pinkston.connect_insights_db(db_path) as conn:
+        conn.execute("DROP VIEW insights_pinkston;")
+        conn.execute(f"DROP TABLE {consumer_pinkston.MESSAGES_TABLE};")
+    conn.close()
+
+    conn = consumer_pinkston.connect_insights_db(db_path)
+    try:
+        (count,) = conn.execute("SELECT COUNT(*) FROM insights_pinkston;").fetchone()
+        assert count == 0
+    finally:
+        conn.close()
+
+
+#####################################
+# Writer Thread
+#####################################
+
+
+def test_writer_thread_writes_once_and_reads_via_view(tmp_path: pathlib.Path):
+    db_path = tmp_path / "test.sqlite"
+
+    conn = consumer_pinkston.connect_insights_db(db_path)
+    rows = queue.Queue()
+    writer = threading.Thread(target=consumer_pinkston.run_writer, args=(conn, rows))
+    writer.start()
+
+    batch = consumer_pinkston.MessageBatch()
+    for _ in range(consumer_pinkston.BATCH_SIZE + 5):
+        batch.append(_raw())
+    consumer_pinkston.enqueue_batch(batch, rows)
+    assert len(batch) == 0
+
+    rows.put(None)
+    writer.join(timeout=5)
+    assert not writer.is_alive()
+
+    try:
+        (messages,) = conn.execute(
+            f"SELECT COUNT(*) FROM {consumer_pinkston.MESSAGES_TABLE};"
+        ).fetchone()
+        (insights,) = conn.execute("SELECT COUNT(*) FROM insights_pinkston;").fetchone()
+        assert messages == consumer_pinkston.BATCH_SIZE + 5
+        assert insights == messages
+
+        (kind,) = conn.execute(
+            "SELECT type FROM sqlite_master WHERE name = 'insights_pinkston';"
+        ).fetchone()
+        assert kind == "view"
+
+        (label,) = conn.execute("SELECT sentiment_label FROM insights_pinkston LIMIT 1;").fetchone()
+        assert label == "high"
+    finally:
+        conn.close()
+
+
+def test_enqueue_batch_interrupted_does_not_requeue_rows():
+    class InterruptingQueue(queue.Queue):
+        def put(self, item, block=True, timeout=None):
+            if self.qsize() == 2:
+                raise KeyboardInterrupt
+            super().put(item, block, timeout)
+
+    rows = InterruptingQueue()
+    batch = consumer_pinkston.MessageBatch()
+    for _ in range(5):
+        batch.append(_raw())
+    with pytest.raises(KeyboardInterrupt):
+        consumer_pinkston.enqueue_batch(batch, rows)
+
+    # The consumer's finally flushes the batch again; nothing may be queued twice
+    consumer_pinkston.enqueue_batch(batch, rows)
+    assert rows.qsize() == 2
+
+
+def test_write_rows_rolls_back_whole_batch_on_failure(tmp_path: pathlib.Path):
+    conn = consumer_pinkston.connect_insights_db(tmp_path / "test.sqlite")
+    try:
+        good = consumer_pinkston.process_message(_raw())
+        consumer_pinkston.write_rows([good, good, good[:3]], conn, conn.cursor())
+        assert not conn.in_transaction
+
+        (count,) = conn.execute("SELECT COUNT(*) FROM insights_pinkston;").fetchone()
+        assert count == 0
+    finally:
+        conn.close()
+
+
+#####################################
+# Live Data File Watching
+#####################################
+
+
+def test_wait_for_changes_wakes_on_write(tmp_path: pathlib.Path):
+    live = tmp_path / "live.json"
+    watcher = consumer_pinkston.open_file_watcher(live)
+    if watcher is None:
+        pytest.skip("inotify not available on this platform")
+    try:
+        live.write_text('{"message": "hi"}\n', encoding="utf-8")
+        start = time.monotonic()
+        consumer_pinkston.wait_for_changes(watcher, live, 5)
+        assert time.monotonic() - start < 1
+    finally:
+        watcher.close()
+
+
+def test_wait_for_changes_without_watcher_sleeps(tmp_path: pathlib.Path):
+    start = time.monotonic()
+    consumer_pinkston.wait_for_changes(None, tmp_path / "live.json", 0.05)
+    assert time.monotonic() - start >= 0.05
+
+
+#####################################
+# Live Data File Reader
+#####################################
+
+
+def _messages(reader) -> list:
+    """Return the message text of every newly read line."""
+    return [raw.message for raw in reader.read_messages()]
+
+
+def test_live_file_reader_holds_partial_lines(tmp_path: pathlib.Path):
+    live = tmp_path / "live.json"
+    live.write_bytes(b'{"message": "1"}\n\n  \r\n{"message": "2"')
+    reader = consumer_pinkston.LiveFileReader(live)
+    try:
+        assert _messages(reader) == ["1"]
+        with live.open("ab") as f:
+            f.write(b'}\r\n {"message": "3"}\n')
+        assert _messages(reader) == ["2", "3"]
+        assert _messages(reader) == []
+        assert reader.position == live.stat().st_size
+    finally:
+        reader.close()
+
+
+def test_live_file_reader_restarts_when_file_replaced(tmp_path: pathlib.Path):
+    live = tmp_path / "live.json"
+    live.write_bytes(b'{"message": "1"}\n{"message": "2"}\n')
+    reader = consumer_pinkston.LiveFileReader(live)
+    try:
+        assert len(list(reader.read_messages())) == 2
+        live.unlink()
+        live.write_bytes(b'{"message": "3"}\n')
+        assert _messages(reader) == ["3"]
+    finally:
+        reader.close()
+
+
+def test_live_file_reader_maps_from_large_offsets(tmp_path: pathlib.Path):
+    live = tmp_path / "live.json"
+    lines = [b'{"message": "%d"}\n' % i for i in range(20000)]
+    live.write_bytes(b"".join(lines[:10000]))
+    reader = consumer_pinkston.LiveFileReader(live)
+    try:
+        assert len(list(reader.read_messages())) == 10000
+        with live.open("ab") as f:
+            f.write(b"".join(lines[10000:]))
+        assert _messages(reader) == [str(i) for i in range(10000, 20000)]
+    finally:
+        reader.close()
+
+
+def test_live_file_reader_raises_decode_error_on_malformed_line(tmp_path: pathlib.Path):
+    live = tmp_path / "live.json"
+    live.write_bytes(b'{"message": "1"}\nnot json\n')
+    reader = consumer_pinkston.LiveFileReader(live)
+    try:
+        messages = reader.read_messages()
+        assert next(messages).message == "1"
+        with pytest.raises(msgspec.DecodeError):
+            next(messages)
+    finally:
+        reader.close()